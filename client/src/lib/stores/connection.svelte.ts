@@ -12,7 +12,8 @@
  *
  *   chatState.connect();                   // open WebSocket
  *   chatState.sendMessage("Hello");        // send user message
- *   chatState.messages                     // ChatMessage[] (reactive)
+ *   chatState.messages                     // ChatMessage[] (reactive; rejected
+ *                                          //   user messages carry `error`)
  *   chatState.connectionState              // 'connected' | 'disconnected' | 'reconnecting'
  *   chatState.isStreaming                  // true while assistant chunks arrive
  *   chatState.historyLoaded               // true after history.response received
@@ -29,6 +30,8 @@ export interface ChatMessage {
   id: string;
   role: "user" | "assistant";
   content: string;
+  /** Set when the server rejected this user message (never stored or answered). */
+  error?: string;
 }
 
 function createChatState() {
@@ -96,11 +99,23 @@ function createChatState() {
         }
       }
     } else if (msg.type === "error") {
-      console.error(
-        `Server error [${msg.payload.code}]: ${msg.payload.message}`,
-      );
+      const { code, message, context } = msg.payload;
+      const last = messages[messages.length - 1];
+      // Rejections are answered in order, so a rate limit on a text message
+      // (or on the connection, with no context) belongs to the newest one.
+      if (
+        code === "RATE_LIMITED" &&
+        (!context || context === "user.input.text") &&
+        last?.role === "user" &&
+        !last.error
+      ) {
+        messages[messages.length - 1] = { ...last, error: message };
+      } else {
+        console.error(`Server error [${code}]: ${message}`);
+      }
     }
     // connection.pong — ignored (no heartbeat timer)
+    // generation.queued — ignored (response streams once a slot frees up)
   }
 
   return {
@@ -58,6 +58,15 @@ export interface HistoryResponseMessage {
   payload: HistoryResponsePayload;
 }
 
+export interface GenerationQueuedPayload {
+  position: number;
+}
+
+export interface GenerationQueuedMessage {
+  type: "generation.queued";
+  payload: GenerationQueuedPayload;
+}
+
 export interface ErrorPayload {
   code: string;
   message: string;
@@ -77,6 +86,7 @@ export type OutgoingMessage = UserInputText | HistoryRequestMessage;
 export type IncomingMessage =
   | AssistantResponseText
   | HistoryResponseMessage
+  | GenerationQueuedMessage
   | ErrorMessage
   | ConnectionPong;
 
@@ -0,0 +1,278 @@
+"""
+Streaming NDJSON export/import of the memory stream.
+
+One JSON object per line, tagged with the table it belongs to:
+    {"table": "messages", "id": 1, "role": "user", "content": "hi",
+     "created_at": "2025-01-01 12:00:00"}
+    {"table": "checkpoints", "name": "fact_extractor", "last_message_id": 1}
+    {"table": "facts", "id": 1, "subject": "user", "predicate": "dog name",
+     "value": "Max", "source_ids": [1], "confidence": 0.9,
+     "updated_at": "2025-01-01 12:00:05", "superseded_by": null}
+
+Export walks both storage tiers with cursors and writes in chunks, so
+memory stays constant regardless of database size. It reads one
+snapshot on its own connection, so messages, checkpoints and facts are
+mutually consistent and a live server keeps writing meanwhile. Import
+batches rows into executemany calls inside one transaction. Lines for
+unknown tables are skipped, so newer dumps can be loaded by older servers.
+
+Usage:
+    # CLI (run from project root; uses config.yaml's data_dir). Export is
+    # safe next to a running server; import needs it stopped — use
+    # POST /admin/import on a live server.
+    python -m server.backup export ace.ndjson
+    python -m server.backup import ace.ndjson
+
+    # In code:
+    async for chunk in export_ndjson():
+        out.write(chunk)
+    counts = await import_ndjson(chunks)  # chunks: AsyncIterable[bytes]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections.abc import AsyncGenerator, AsyncIterable
+from datetime import datetime
+
+from server.database import (
+    StoredMessage,
+    bulk_import,
+    close_db,
+    get_checkpoints,
+    init_db,
+    iter_facts,
+    iter_messages,
+    lock_database,
+    read_snapshot,
+)
+
+# Rows per executemany call on import.
+_IMPORT_BATCH = 10_000
+
+# Bytes per read when streaming a file into import_ndjson.
+_READ_CHUNK = 1 << 20
+
+# SQLite's CURRENT_TIMESTAMP format, used for created_at and updated_at.
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _encode(records: list[dict]) -> bytes:
+    """Serialize records as NDJSON lines."""
+    lines = [json.dumps(record, ensure_ascii=False) for record in records]
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def export_ndjson() -> AsyncGenerator[bytes, None]:
+    """Yield the memory stream and derived tables as NDJSON, one chunk per batch."""
+    async with read_snapshot() as snapshot:
+        async for batch in iter_messages(snapshot):
+            yield _encode(
+                [
+                    {
+                        "table": "messages",
+                        "id": m.id,
+                        "role": m.role,
+                        "content": m.content,
+                        "created_at": m.created_at,
+                    }
+                    for m in batch
+                ]
+            )
+
+        checkpoints = await get_checkpoints(snapshot)
+        if checkpoints:
+            yield _encode(
+                [
+                    {"table": "checkpoints", "name": name, "last_message_id": last_id}
+                    for name, last_id in checkpoints.items()
+                ]
+            )
+
+        async for batch in iter_facts(snapshot):
+            yield _encode([{"table": "facts", **fact} for fact in batch])
+
+
+async def _split_lines(chunks: AsyncIterable[bytes]) -> AsyncGenerator[bytes, None]:
+    """Re-chunk a byte stream into lines, handling lines split across chunks."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+def _require_int(record: dict, field: str, optional: bool = False) -> None:
+    """Raise ValueError unless record[field] is an int (or None if optional)."""
+    value = record.get(field)
+    if optional and value is None:
+        return
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"{record['table']}.{field} must be an integer: {value!r}")
+
+
+def _require_str(record: dict, field: str) -> None:
+    """Raise ValueError unless record[field] is a string."""
+    value = record.get(field)
+    if not isinstance(value, str):
+        raise ValueError(f"{record['table']}.{field} must be a string: {value!r}")
+
+
+def _require_timestamp(record: dict, field: str) -> None:
+    """Raise ValueError unless record[field] is a SQLite UTC timestamp.
+
+    Stored timestamps are compared as text against datetime('now') and
+    parsed by the fact extractor, so only the CURRENT_TIMESTAMP format
+    is accepted.
+    """
+    _require_str(record, field)
+    try:
+        datetime.strptime(record[field], _TIMESTAMP_FORMAT)
+    except ValueError:
+        raise ValueError(
+            f"{record['table']}.{field} must look like 2025-01-01 12:00:00: "
+            f"{record[field]!r}"
+        ) from None
+
+
+def _parse_message(record: dict) -> StoredMessage:
+    _require_int(record, "id")
+    for field in ("role", "content"):
+        _require_str(record, field)
+    _require_timestamp(record, "created_at")
+    return StoredMessage(
+        id=record["id"],
+        role=record["role"],
+        content=record["content"],
+        created_at=record["created_at"],
+    )
+
+
+def _parse_fact(record: dict) -> dict:
+    _require_int(record, "id")
+    _require_int(record, "superseded_by", optional=True)
+    for field in ("subject", "predicate", "value"):
+        _require_str(record, field)
+    _require_timestamp(record, "updated_at")
+    source_ids = record.get("source_ids")
+    if not isinstance(source_ids, list) or not all(
+        isinstance(i, int) and not isinstance(i, bool) for i in source_ids
+    ):
+        raise ValueError(f"facts.source_ids must be a list of integers: {source_ids!r}")
+    confidence = record.get("confidence")
+    if not isinstance(confidence, int | float) or isinstance(confidence, bool):
+        raise ValueError(f"facts.confidence must be a number: {confidence!r}")
+    return {
+        field: record[field]
+        for field in (
+            "id",
+            "subject",
+            "predicate",
+            "value",
+            "source_ids",
+            "confidence",
+            "updated_at",
+            "superseded_by",
+        )
+    }
+
+
+def _parse_checkpoint(record: dict) -> tuple[str, int]:
+    _require_int(record, "last_message_id")
+    if not isinstance(record["name"], str):
+        raise ValueError("checkpoints.name must be a string")
+    return record["name"], record["last_message_id"]
+
+
+_PARSERS = {
+    "messages": _parse_message,
+    "facts": _parse_fact,
+    "checkpoints": _parse_checkpoint,
+}
+
+
+async def _record_batches(
+    chunks: AsyncIterable[bytes],
+) -> AsyncGenerator[tuple[str, list], None]:
+    """Parse NDJSON lines into (table, rows) batches, skipping unknown tables."""
+    batches: dict[str, list] = {table: [] for table in _PARSERS}
+    async for line in _split_lines(chunks):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError("Each NDJSON line must be a JSON object")
+        table = record.get("table")
+        if table not in _PARSERS:
+            continue
+        batch = batches[table]
+        batch.append(_PARSERS[table](record))
+        if len(batch) >= _IMPORT_BATCH:
+            yield table, batch
+            batches[table] = []
+    for table, batch in batches.items():
+        if batch:
+            yield table, batch
+
+
+async def import_ndjson(chunks: AsyncIterable[bytes]) -> dict[str, int]:
+    """Bulk-import an NDJSON byte stream produced by export_ndjson().
+
+    Returns:
+        Rows inserted per table (existing messages and facts are skipped).
+
+    Raises:
+        ValueError, KeyError: If a line is malformed (not a JSON object,
+            missing field, wrong field type, unparseable timestamp).
+            Nothing is committed in that case.
+    """
+    return await bulk_import(_record_batches(chunks))
+
+
+async def _read_file(path: str) -> AsyncGenerator[bytes, None]:
+    with open(path, "rb") as f:
+        while chunk := f.read(_READ_CHUNK):
+            yield chunk
+
+
+async def _run(command: str, path: str) -> None:
+    await init_db()
+    try:
+        if command == "export":
+            out = sys.stdout.buffer if path == "-" else open(path, "wb")
+            try:
+                async for chunk in export_ndjson():
+                    out.write(chunk)
+            finally:
+                if out is not sys.stdout.buffer:
+                    out.close()
+        else:
+            lock_database()
+            counts = await import_ndjson(_read_file(path))
+            summary = ", ".join(f"{n} {table}" for table, n in counts.items())
+            print(f"Imported {summary}", file=sys.stderr)
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    """CLI entry point: python -m server.backup {export,import} PATH."""
+    parser = argparse.ArgumentParser(
+        prog="python -m server.backup",
+        description="Export or import the ACE memory stream as NDJSON.",
+    )
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("path", help="NDJSON file ('-' for stdout on export)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_run(args.command, args.path))
+    except RuntimeError as e:
+        parser.exit(1, f"{parser.prog}: {e}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,10 +13,15 @@ Usage:
     config.llm.provider # "ollama"
     config.llm.host     # "http://localhost:11434"
     config.llm.api_key  # optional, for cloud providers
+    config.limits.max_concurrent_generations  # 2
+
+Configuration can be reloaded at runtime (see server/config_reload.py).
+Always call get_config() at the point of use rather than holding on to
+the returned object, so reloaded values take effect.
 """
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import yaml
@@ -30,6 +35,32 @@ class ServerConfig:
     host: str
     port: int
     data_dir: str = "data"
+    admin_routes: bool = False
+    warmup: bool = True
+    reload_interval: float = 2.0
+
+
+@dataclass(frozen=True)
+class ReplayConfig:
+    """Settings for the record/replay adapter (provider "replay").
+
+    Args:
+        mode: "record" wraps `upstream` and appends exchanges to `file`;
+            "replay" serves them back without a model.
+        file: Recording path, relative to the project root.
+        upstream: Provider to record from (e.g., "ollama").
+        match: "messages" replays the recording whose input matches
+            exactly, ignoring server-injected system messages (facts);
+            "sequence" replays recordings in order, ignoring input.
+        time_scale: Multiplier for recorded delays. 1.0 is real time,
+            0 replays instantly.
+    """
+
+    mode: str = "replay"
+    file: str = "data/replay.jsonl"
+    upstream: str = "ollama"
+    match: str = "messages"
+    time_scale: float = 1.0
 
 
 @dataclass(frozen=True)
@@ -39,28 +70,76 @@ class LLMConfig:
     context_messages: int = 50
     host: str = ""
     api_key: str = ""
+    keep_alive: str = ""
+    replay: ReplayConfig = ReplayConfig()
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Token-bucket parameters.
+
+    Args:
+        rate: Tokens refilled per second.
+        burst: Bucket capacity (max messages accepted back-to-back).
+    """
+
+    rate: float
+    burst: int
+
+
+@dataclass(frozen=True)
+class LimitsConfig:
+    max_message_bytes: int = 64 * 1024
+    max_concurrent_generations: int = 2
+    connection_rate: RateLimit = RateLimit(rate=5.0, burst=20)
+    message_rates: dict[str, RateLimit] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ArchiveConfig:
+    enabled: bool = True
+    min_age_days: int = 30
+    keep_recent: int = 1000
+    block_size: int = 500
+    interval_seconds: int = 3600
+
+
+@dataclass(frozen=True)
+class FactsConfig:
+    enabled: bool = True
+    batch_size: int = 20
+    interval_seconds: int = 60
+    inject_limit: int = 20
 
 
 @dataclass(frozen=True)
 class Config:
     server: ServerConfig
     llm: LLMConfig
+    limits: LimitsConfig = LimitsConfig()
+    archive: ArchiveConfig = ArchiveConfig()
+    facts: FactsConfig = FactsConfig()
 
 
 _config: Config | None = None
 
 
-def load_config() -> Config:
+def load_config(override_env: bool = False) -> Config:
     """Load configuration from config.yaml and .env at the project root.
 
+    Args:
+        override_env: Let .env values replace variables already in the
+            environment. Used on reload so edits to .env take effect.
+
     Returns:
         A Config instance with all settings populated.
 
     Raises:
         FileNotFoundError: If config.yaml is missing.
-        ValueError: If required environment variables are not set.
+        ValueError: If required environment variables are not set or a
+            setting is out of range.
     """
-    load_dotenv(PROJECT_ROOT / ".env")
+    load_dotenv(PROJECT_ROOT / ".env", override=override_env)
 
     config_path = PROJECT_ROOT / "config.yaml"
     with open(config_path) as f:
@@ -71,11 +150,17 @@ def load_config() -> Config:
     llm_host = llm_raw.get("host", os.environ.get("OLLAMA_HOST", ""))
 
     server_raw = raw["server"]
-    return Config(
+    limits_raw = raw.get("limits") or {}
+    archive_raw = raw.get("archive") or {}
+    facts_raw = raw.get("facts") or {}
+    config = Config(
         server=ServerConfig(
             host=server_raw["host"],
             port=server_raw["port"],
             data_dir=server_raw.get("data_dir", "data"),
+            admin_routes=server_raw.get("admin_routes", False),
+            warmup=server_raw.get("warmup", True),
+            reload_interval=server_raw.get("reload_interval", 2.0),
         ),
         llm=LLMConfig(
             provider=llm_raw["provider"],
@@ -83,7 +168,120 @@ def load_config() -> Config:
             context_messages=llm_raw.get("context_messages", 50),
             host=llm_host,
             api_key=api_key,
+            keep_alive=str(llm_raw.get("keep_alive", "")),
+            replay=_parse_replay(llm_raw.get("replay") or {}),
+        ),
+        limits=_parse_limits(limits_raw),
+        archive=_parse_archive(archive_raw),
+        facts=_parse_facts(facts_raw),
+    )
+    _validate(config)
+    return config
+
+
+def _validate(config: Config) -> None:
+    """Reject settings that would break the server at runtime.
+
+    Raises:
+        ValueError: If a setting is out of range.
+    """
+    replay = config.llm.replay
+    if replay.mode not in ("record", "replay"):
+        raise ValueError("llm.replay.mode must be 'record' or 'replay'")
+    if replay.match not in ("messages", "sequence"):
+        raise ValueError("llm.replay.match must be 'messages' or 'sequence'")
+    if replay.time_scale < 0:
+        raise ValueError("llm.replay.time_scale must be >= 0")
+    if replay.upstream == "replay":
+        raise ValueError("llm.replay.upstream cannot be 'replay'")
+    if config.llm.context_messages < 1:
+        raise ValueError("llm.context_messages must be at least 1")
+    if config.limits.max_concurrent_generations < 1:
+        raise ValueError("limits.max_concurrent_generations must be at least 1")
+    if config.limits.max_message_bytes < 1:
+        raise ValueError("limits.max_message_bytes must be at least 1")
+    for name, limit in [
+        ("connection", config.limits.connection_rate),
+        *config.limits.message_rates.items(),
+    ]:
+        if limit.rate <= 0 or limit.burst < 1:
+            raise ValueError(f"limits rate for {name} must have rate > 0, burst >= 1")
+    archive = config.archive
+    if archive.block_size < 1:
+        raise ValueError("archive.block_size must be at least 1")
+    if archive.interval_seconds <= 0:
+        raise ValueError("archive.interval_seconds must be > 0")
+    if archive.min_age_days < 0:
+        raise ValueError("archive.min_age_days must be >= 0")
+    if archive.keep_recent < 0:
+        raise ValueError("archive.keep_recent must be >= 0")
+    facts = config.facts
+    if facts.batch_size < 1:
+        raise ValueError("facts.batch_size must be at least 1")
+    if facts.interval_seconds <= 0:
+        raise ValueError("facts.interval_seconds must be > 0")
+    if facts.inject_limit < 0:
+        raise ValueError("facts.inject_limit must be >= 0")
+
+
+def _parse_replay(raw: dict) -> ReplayConfig:
+    """Build ReplayConfig from the optional `llm.replay` section of config.yaml."""
+    defaults = ReplayConfig()
+    return ReplayConfig(
+        mode=raw.get("mode", defaults.mode),
+        file=raw.get("file", defaults.file),
+        upstream=raw.get("upstream", defaults.upstream),
+        match=raw.get("match", defaults.match),
+        time_scale=float(raw.get("time_scale", defaults.time_scale)),
+    )
+
+
+def _parse_archive(raw: dict) -> ArchiveConfig:
+    """Build ArchiveConfig from the optional `archive` section of config.yaml."""
+    defaults = ArchiveConfig()
+    return ArchiveConfig(
+        enabled=raw.get("enabled", defaults.enabled),
+        min_age_days=raw.get("min_age_days", defaults.min_age_days),
+        keep_recent=raw.get("keep_recent", defaults.keep_recent),
+        block_size=raw.get("block_size", defaults.block_size),
+        interval_seconds=raw.get("interval_seconds", defaults.interval_seconds),
+    )
+
+
+def _parse_facts(raw: dict) -> FactsConfig:
+    """Build FactsConfig from the optional `facts` section of config.yaml."""
+    defaults = FactsConfig()
+    return FactsConfig(
+        enabled=raw.get("enabled", defaults.enabled),
+        batch_size=raw.get("batch_size", defaults.batch_size),
+        interval_seconds=raw.get("interval_seconds", defaults.interval_seconds),
+        inject_limit=raw.get("inject_limit", defaults.inject_limit),
+    )
+
+
+def _parse_rate_limit(raw: dict, default: RateLimit) -> RateLimit:
+    """Build a RateLimit from a {rate, burst} mapping, falling back to default."""
+    return RateLimit(
+        rate=float(raw.get("rate", default.rate)),
+        burst=int(raw.get("burst", default.burst)),
+    )
+
+
+def _parse_limits(raw: dict) -> LimitsConfig:
+    """Build LimitsConfig from the optional `limits` section of config.yaml."""
+    defaults = LimitsConfig()
+    return LimitsConfig(
+        max_message_bytes=raw.get("max_message_bytes", defaults.max_message_bytes),
+        max_concurrent_generations=raw.get(
+            "max_concurrent_generations", defaults.max_concurrent_generations
+        ),
+        connection_rate=_parse_rate_limit(
+            raw.get("connection") or {}, defaults.connection_rate
         ),
+        message_rates={
+            msg_type: _parse_rate_limit(params, defaults.connection_rate)
+            for msg_type, params in (raw.get("messages") or {}).items()
+        },
     )
 
 
@@ -97,3 +295,9 @@ def get_config() -> Config:
     if _config is None:
         _config = load_config()
     return _config
+
+
+def set_config(config: Config) -> None:
+    """Replace the cached configuration. Used by hot reload."""
+    global _config
+    _config = config
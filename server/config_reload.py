@@ -0,0 +1,115 @@
+"""
+Hot configuration reload.
+
+Polls config.yaml and .env for changes. On change, loads and validates
+the new configuration, builds a new LLM router for it, then swaps both
+in. Live WebSocket connections are untouched: in-flight generations
+finish on the router they started with, new turns pick up the new one.
+An invalid file is logged and ignored — the running config stays.
+
+Settings that are bound at startup (server host/port, data_dir) are
+reported as requiring a restart and keep their running values until then.
+
+Usage:
+    from server.config_reload import reload_config, watch_config
+
+    task = asyncio.create_task(watch_config())  # at startup
+    reload_config()                             # force a reload now
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, replace
+
+from server.config import PROJECT_ROOT, get_config, load_config, set_config
+from server.llm.router import build_router, set_router
+from server.rate_limit import get_generation_gate
+
+logger = logging.getLogger(__name__)
+
+_WATCHED = (PROJECT_ROOT / "config.yaml", PROJECT_ROOT / ".env")
+
+# Changing these needs a restart: the socket and database are already open.
+_RESTART_ONLY = ("host", "port", "data_dir")
+
+
+@dataclass
+class ReloadStats:
+    reloads: int = 0
+    failures: int = 0
+
+
+reload_stats = ReloadStats()
+
+
+def reload_config() -> bool:
+    """Reload config.yaml and .env and apply the result.
+
+    The new router is built before anything is swapped, so a bad
+    provider setting leaves the old config and router in place.
+
+    Returns:
+        True if the new configuration was applied.
+    """
+    old = get_config()
+    try:
+        new = load_config(override_env=True)
+        router = build_router(new.llm) if new.llm != old.llm else None
+    except Exception:
+        reload_stats.failures += 1
+        logger.exception("Config reload failed; keeping current config")
+        return False
+
+    for name in _RESTART_ONLY:
+        if getattr(new.server, name) != getattr(old.server, name):
+            logger.warning("server.%s changed; takes effect after restart", name)
+    # Keep reporting what is actually in use (e.g. where the open DB lives).
+    new = replace(
+        new,
+        server=replace(
+            new.server, **{name: getattr(old.server, name) for name in _RESTART_ONLY}
+        ),
+    )
+
+    set_config(new)
+    if router is not None:
+        set_router(router)
+    get_generation_gate().configure(new.limits.max_concurrent_generations)
+
+    reload_stats.reloads += 1
+    logger.info(
+        "Config reloaded (#%d)%s",
+        reload_stats.reloads,
+        "; LLM router rebuilt" if router is not None else "",
+    )
+    return True
+
+
+def _snapshot() -> tuple[tuple[int, int] | None, ...]:
+    """(mtime_ns, size) of each watched file, None if missing."""
+    result = []
+    for path in _WATCHED:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            result.append(None)
+        else:
+            result.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(result)
+
+
+async def watch_config() -> None:
+    """Background job: reload the config whenever a watched file changes.
+
+    Polls every server.reload_interval seconds, re-read after each
+    reload. Runs until cancelled, or until a reload sets the interval to
+    0 — watching then stays off until restart.
+    """
+    last = _snapshot()
+    while (interval := get_config().server.reload_interval) > 0:
+        await asyncio.sleep(interval)
+        current = _snapshot()
+        if current != last:
+            last = current
+            reload_config()
+    logger.info("server.reload_interval is 0; config watching stopped")
@@ -5,6 +5,11 @@ Manages WebSocket connections: accept, receive/parse messages,
 dispatch responses, handle disconnections. Does NOT contain
 business logic — delegates to the session manager.
 
+Admission control (frame size, per-connection rate limits, the global
+generation cap) is enforced here, before messages reach the session
+manager. Limits come from the `limits` section of config.yaml and are
+re-read per message, so a config reload applies to open connections.
+
 Usage:
     # In main.py:
     from server.connection import websocket_endpoint
@@ -19,12 +24,15 @@ import logging
 from fastapi import WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 
+from server.config import get_config
 from server.protocol import (
     AssistantResponseText,
     ConnectionPing,
     ConnectionPong,
     ErrorMessage,
     ErrorPayload,
+    GenerationQueued,
+    GenerationQueuedPayload,
     HistoryMessage,
     HistoryRequest,
     HistoryResponse,
@@ -34,6 +42,7 @@ from server.protocol import (
     UserInputText,
     parse_incoming,
 )
+from server.rate_limit import ConnectionLimiter, get_generation_gate
 from server.session_manager import get_recent_history, handle_user_message
 
 logger = logging.getLogger(__name__)
@@ -69,13 +78,32 @@ manager = ConnectionManager()
 
 
 async def websocket_endpoint(websocket: WebSocket) -> None:
-    """Main WebSocket handler. Accepts connection, loops receiving messages."""
+    """Main WebSocket handler. Accepts connection, loops receiving messages.
+
+    Oversized frames and messages over the connection's rate limits are
+    rejected with an error message; the connection stays open.
+    """
+    limiter = ConnectionLimiter(get_config().limits)
     await manager.connect(websocket)
     try:
         while True:
             raw = await websocket.receive_text()
+            limits = get_config().limits
+            if limits != limiter.limits:
+                limiter.reconfigure(limits)
+            if not limiter.allow_frame():
+                await manager.send(
+                    websocket,
+                    ErrorMessage(
+                        payload=ErrorPayload(
+                            code="RATE_LIMITED",
+                            message="Too many messages, slow down",
+                        )
+                    ),
+                )
+                continue
             try:
-                message = parse_incoming(raw)
+                message = parse_incoming(raw, max_bytes=limits.max_message_bytes)
             except ProtocolError as e:
                 await manager.send(
                     websocket,
@@ -83,6 +111,19 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
                 )
                 continue
 
+            if not limiter.allow(message.type):
+                await manager.send(
+                    websocket,
+                    ErrorMessage(
+                        payload=ErrorPayload(
+                            code="RATE_LIMITED",
+                            message="Too many messages, slow down",
+                            context=message.type,
+                        )
+                    ),
+                )
+                continue
+
             await handle_message(websocket, message)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
@@ -97,9 +138,10 @@ async def handle_message(
 ) -> None:
     """Dispatch a parsed message to the appropriate handler.
 
-    For user text: streams LLM response chunks as partial messages,
-    then sends a final complete message. Catches LLM errors and
-    sends them as error messages without dropping the connection.
+    For user text: waits for a generation slot (sending the queue
+    position if the server is busy), streams LLM response chunks as
+    partial messages, then sends a final complete message. Catches LLM
+    errors and sends them as error messages without dropping the connection.
 
     For history request: loads recent messages from DB and sends them.
     """
@@ -119,37 +161,49 @@ async def handle_message(
             ),
         )
     elif isinstance(message, UserInputText):
-        text = message.payload.text
-        try:
-            full_text = ""
-            async for chunk in handle_user_message(text):
-                full_text += chunk
-                await manager.send(
-                    websocket,
-                    AssistantResponseText(
-                        payload=TextResponsePayload(
-                            text=chunk,
-                            is_partial=True,
-                        )
-                    ),
-                )
+
+        async def notify_queued(position: int) -> None:
             await manager.send(
                 websocket,
-                AssistantResponseText(
-                    payload=TextResponsePayload(
-                        text=full_text,
-                        is_partial=False,
-                    )
-                ),
+                GenerationQueued(payload=GenerationQueuedPayload(position=position)),
             )
-        except Exception:
-            logger.exception("LLM error")
+
+        async with get_generation_gate().acquire(on_queued=notify_queued):
+            await _stream_response(websocket, message.payload.text)
+
+
+async def _stream_response(websocket: WebSocket, text: str) -> None:
+    """Stream one LLM turn to the client as partial + final messages."""
+    try:
+        full_text = ""
+        async for chunk in handle_user_message(text):
+            full_text += chunk
             await manager.send(
                 websocket,
-                ErrorMessage(
-                    payload=ErrorPayload(
-                        code="LLM_ERROR",
-                        message="Failed to get LLM response",
+                AssistantResponseText(
+                    payload=TextResponsePayload(
+                        text=chunk,
+                        is_partial=True,
                     )
                 ),
             )
+        await manager.send(
+            websocket,
+            AssistantResponseText(
+                payload=TextResponsePayload(
+                    text=full_text,
+                    is_partial=False,
+                )
+            ),
+        )
+    except Exception:
+        logger.exception("LLM error")
+        await manager.send(
+            websocket,
+            ErrorMessage(
+                payload=ErrorPayload(
+                    code="LLM_ERROR",
+                    message="Failed to get LLM response",
+                )
+            ),
+        )
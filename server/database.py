@@ -4,21 +4,74 @@ SQLite message persistence.
 Stores all messages in a single continuous stream (no sessions).
 Uses aiosqlite for async access.
 
+Two tiers:
+    messages          — hot table, the recent tail. Hot-path queries
+                        (context assembly, history on connect) read only
+                        this while it holds enough rows.
+    message_archive   — cold tier. Old messages compressed in blocks of
+                        consecutive rows, keyed by id range. Filled by the
+                        background compaction job.
+
+Lookups by id/range and search read both tiers transparently.
+
+Long-term memory (spec §9.1) lives in `facts`: normalized
+(subject, predicate, value) triples extracted from the stream by the
+background fact extractor, with superseded versions kept for provenance.
+
 Usage:
     from server.database import init_db, close_db, append_message, get_recent_messages
 
     await init_db()                          # call at startup
     await append_message("user", "hello")    # store a message
     msgs = await get_recent_messages(50)     # last 50 messages as (role, content)
+    older = await get_messages_before(before_id=1234, limit=50)  # pagination
+    await compact_messages(min_age_days=30, keep_recent=1000, block_size=500)
+    async with read_snapshot() as snapshot:  # consistent view, for export
+        async for batch in iter_messages(snapshot):
+            ...
+    await bulk_import(batches)               # fast import, one transaction
+    facts = await get_facts(["user"], limit=20)  # current long-term facts
     await close_db()                         # call at shutdown
 """
 
+import asyncio
+import bisect
+import json
+import logging
+import tempfile
+import zlib
+from collections.abc import AsyncGenerator, AsyncIterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 import aiosqlite
 
 from server.config import PROJECT_ROOT, get_config
 
+logger = logging.getLogger(__name__)
+
 _db: aiosqlite.Connection | None = None
 
+# Open lock file while this process holds lock_database().
+_lock_file: IO[bytes] | None = None
+
+# Serializes multi-statement writes on the shared connection, so a commit
+# from one coroutine never lands in the middle of another's transaction.
+_write_lock = asyncio.Lock()
+
+# Held by compaction for a whole pass. Compaction reads on the shared
+# connection outside _write_lock, so anything else that writes messages
+# in a long transaction (bulk import) holds this too, or compaction
+# could archive rows that are later rolled back.
+_compaction_lock = asyncio.Lock()
+
 _CREATE_TABLE = """
 CREATE TABLE IF NOT EXISTS messages (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -28,47 +81,876 @@ CREATE TABLE IF NOT EXISTS messages (
 );
 """
 
+_CREATE_ARCHIVE_TABLE = """
+CREATE TABLE IF NOT EXISTS message_archive (
+    first_id INTEGER PRIMARY KEY,
+    last_id INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    created_max TIMESTAMP NOT NULL,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+"""
+
+_CREATE_ARCHIVE_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_message_archive_last_id
+ON message_archive (last_id);
+"""
+
+_CREATE_FACTS_TABLE = """
+CREATE TABLE IF NOT EXISTS facts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    subject TEXT NOT NULL,
+    predicate TEXT NOT NULL,
+    value TEXT NOT NULL,
+    source_ids TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    superseded_by INTEGER REFERENCES facts (id)
+);
+"""
+
+_CREATE_FACTS_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_facts_current
+ON facts (subject, predicate) WHERE superseded_by IS NULL;
+"""
+
+_CREATE_CHECKPOINTS_TABLE = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    name TEXT PRIMARY KEY,
+    last_message_id INTEGER NOT NULL
+);
+"""
+
+_CODEC = "zlib+json"
+
+# Pages released per incremental_vacuum after a compaction pass.
+_VACUUM_PAGES = 2000
+
+
+@dataclass(frozen=True)
+class StoredMessage:
+    """A persisted message with its stream position.
+
+    Args:
+        id: Position in the continuous stream (monotonic).
+        role: "user" or "assistant".
+        content: The text content of the message.
+        created_at: SQLite timestamp string (UTC).
+    """
+
+    id: int
+    role: str
+    content: str
+    created_at: str
+
+
+@dataclass(frozen=True)
+class Fact:
+    """A normalized long-term memory fact.
+
+    Args:
+        subject: Who/what the fact is about ("user", "assistant", "max").
+        predicate: The relation ("name", "prefers theme", "dog name").
+        value: The fact's value ("Alex", "dark mode", "Max").
+        source_ids: Ids of the messages the fact was extracted from.
+        confidence: Extractor confidence in [0, 1].
+        updated_at: SQLite timestamp of the last confirmation (UTC).
+    """
+
+    subject: str
+    predicate: str
+    value: str
+    source_ids: tuple[int, ...] = ()
+    confidence: float = 1.0
+    updated_at: str = ""
+
 
 async def init_db() -> None:
-    """Create data directory and messages table. Call once at startup."""
+    """Create data directory and tables. Call once at startup.
+
+    Also switches the database to incremental auto-vacuum so pages freed
+    by compaction can be returned to the OS without a full VACUUM. On an
+    existing database this requires a one-time VACUUM.
+    """
     global _db
-    config = get_config()
-    data_dir = PROJECT_ROOT / config.server.data_dir
-    data_dir.mkdir(parents=True, exist_ok=True)
-    db_path = data_dir / "ace.db"
+    db_path = _db_path()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
     _db = await aiosqlite.connect(str(db_path))
+
+    cursor = await _db.execute("PRAGMA auto_vacuum")
+    (auto_vacuum,) = await cursor.fetchone()
+    if auto_vacuum != 2:  # 2 = INCREMENTAL
+        await _db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        logger.info("Enabling incremental auto-vacuum (one-time VACUUM)")
+        await _db.execute("VACUUM")
+    # Readers (exports, a CLI next to the server) then never block writers.
+    await _db.execute("PRAGMA journal_mode = WAL")
+
     await _db.execute(_CREATE_TABLE)
+    await _db.execute(_CREATE_ARCHIVE_TABLE)
+    await _db.execute(_CREATE_ARCHIVE_INDEX)
+    await _db.execute(_CREATE_FACTS_TABLE)
+    await _db.execute(_CREATE_FACTS_INDEX)
+    await _db.execute(_CREATE_CHECKPOINTS_TABLE)
     await _db.commit()
 
 
 async def close_db() -> None:
-    """Close the database connection. Call once at shutdown."""
-    global _db
+    """Close the database connection (and lock_database()). Call once at shutdown."""
+    global _db, _lock_file
     if _db is not None:
         await _db.close()
         _db = None
+    if _lock_file is not None:
+        _lock_file.close()
+        _lock_file = None
+
+
+def _db_path() -> Path:
+    return PROJECT_ROOT / get_config().server.data_dir / "ace.db"
+
+
+def lock_database() -> None:
+    """Claim the database for this process until close_db() or exit.
+
+    Held by the server for its lifetime and by CLI imports. An import
+    keeps SQLite's write lock for its whole transaction, which would
+    make the server's writes fail with "database is locked"; on a live
+    server, import over HTTP instead. No-op where fcntl is unavailable.
+
+    Raises:
+        RuntimeError: If another process holds the lock.
+    """
+    global _lock_file
+    if fcntl is None or _lock_file is not None:
+        return
+    lock_file = open(_db_path().with_suffix(".lock"), "wb")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        raise RuntimeError(
+            "Database is in use by another process (is the server running?)"
+        ) from None
+    _lock_file = lock_file
+
+
+@asynccontextmanager
+async def read_snapshot() -> AsyncGenerator[aiosqlite.Connection, None]:
+    """Open a separate connection holding one read transaction.
+
+    Everything read through it sees a single snapshot of the database,
+    whatever is committed meanwhile — in particular, compaction (here or
+    in another process) can't move rows between tiers mid-read. With
+    WAL it neither blocks nor waits for writers. A separate connection
+    is needed because commits on the shared one would end the
+    transaction.
+    """
+    snapshot = await aiosqlite.connect(str(_db_path()))
+    try:
+        await snapshot.execute("BEGIN")
+        yield snapshot
+    finally:
+        await snapshot.close()
 
 
 async def append_message(role: str, content: str) -> None:
     """Insert a message into the continuous stream."""
     assert _db is not None, "Database not initialized — call init_db() first"
-    await _db.execute(
-        "INSERT INTO messages (role, content) VALUES (?, ?)",
-        (role, content),
-    )
-    await _db.commit()
+    async with _write_lock:
+        await _db.execute(
+            "INSERT INTO messages (role, content) VALUES (?, ?)",
+            (role, content),
+        )
+        await _db.commit()
 
 
 async def get_recent_messages(limit: int) -> list[tuple[str, str]]:
     """Return the last `limit` messages ordered oldest-first.
 
+    Reads the hot table, falling through to the archive only if it holds
+    fewer than `limit` rows (archive.keep_recent set below the window).
+
     Returns:
         List of (role, content) tuples.
     """
     assert _db is not None, "Database not initialized — call init_db() first"
     cursor = await _db.execute(
-        "SELECT role, content FROM messages ORDER BY id DESC LIMIT ?",
+        "SELECT id, role, content FROM messages ORDER BY id DESC LIMIT ?",
         (limit,),
     )
-    rows = await cursor.fetchall()
-    return list(reversed(rows))
+    newest_first = await cursor.fetchall()
+    rows = [(role, content) for _, role, content in reversed(newest_first)]
+    if len(rows) < limit:
+        if newest_first:
+            before_id = newest_first[-1][0]
+        else:
+            before_id = await _max_message_id() + 1
+        older = await get_messages_before(before_id, limit - len(rows))
+        rows = [(m.role, m.content) for m in older] + rows
+    return rows
+
+
+# --- Cold tier ---
+
+
+def _encode_block(rows: list[tuple[int, str, str, str]]) -> bytes:
+    """Compress a batch of (id, role, content, created_at) rows."""
+    return zlib.compress(json.dumps(rows, ensure_ascii=False).encode(), level=9)
+
+
+def _decode_block(codec: str, data: bytes) -> list[StoredMessage]:
+    """Decompress an archive block back into messages."""
+    if codec != _CODEC:
+        raise ValueError(f"Unknown archive codec: {codec}")
+    rows = json.loads(zlib.decompress(data))
+    return [StoredMessage(*row) for row in rows]
+
+
+async def get_message_range(start_id: int, end_id: int) -> list[StoredMessage]:
+    """Return messages with start_id <= id <= end_id, oldest-first.
+
+    Reads archived blocks overlapping the range plus the hot table.
+    """
+    assert _db is not None, "Database not initialized — call init_db() first"
+    found: dict[int, StoredMessage] = {}
+    cursor = await _db.execute(
+        "SELECT codec, data FROM message_archive "
+        "WHERE first_id <= ? AND last_id >= ? ORDER BY first_id",
+        (end_id, start_id),
+    )
+    async for codec, data in cursor:
+        for msg in _decode_block(codec, data):
+            if start_id <= msg.id <= end_id:
+                found[msg.id] = msg
+    cursor = await _db.execute(
+        "SELECT id, role, content, created_at FROM messages "
+        "WHERE id BETWEEN ? AND ? ORDER BY id",
+        (start_id, end_id),
+    )
+    for row in await cursor.fetchall():
+        found[row[0]] = StoredMessage(*row)
+    return [found[i] for i in sorted(found)]
+
+
+async def get_messages_before(before_id: int, limit: int) -> list[StoredMessage]:
+    """Return up to `limit` messages with id < before_id, oldest-first.
+
+    For history pagination. Falls through to the archive only when the
+    hot table doesn't have enough older rows.
+    """
+    assert _db is not None, "Database not initialized — call init_db() first"
+    cursor = await _db.execute(
+        "SELECT id, role, content, created_at FROM messages "
+        "WHERE id < ? ORDER BY id DESC LIMIT ?",
+        (before_id, limit),
+    )
+    newest_first = [StoredMessage(*row) for row in await cursor.fetchall()]
+
+    if len(newest_first) < limit:
+        oldest_hot = newest_first[-1].id if newest_first else before_id
+        cursor = await _db.execute(
+            "SELECT codec, data FROM message_archive WHERE first_id < ? "
+            "ORDER BY first_id DESC",
+            (oldest_hot,),
+        )
+        async for codec, data in cursor:
+            block = _decode_block(codec, data)
+            newest_first.extend(m for m in reversed(block) if m.id < oldest_hot)
+            if len(newest_first) >= limit:
+                break
+
+    return list(reversed(newest_first[:limit]))
+
+
+async def search_messages(query: str, limit: int = 50) -> list[StoredMessage]:
+    """Case-insensitive substring search over both tiers, newest-first."""
+    assert _db is not None, "Database not initialized — call init_db() first"
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    cursor = await _db.execute(
+        "SELECT id, role, content, created_at FROM messages "
+        "WHERE content LIKE ? ESCAPE '\\' ORDER BY id DESC LIMIT ?",
+        (f"%{escaped}%", limit),
+    )
+    results = [StoredMessage(*row) for row in await cursor.fetchall()]
+    if len(results) >= limit:
+        return results
+
+    needle = query.casefold()
+    seen = {m.id for m in results}
+    cursor = await _db.execute(
+        "SELECT codec, data FROM message_archive ORDER BY first_id DESC"
+    )
+    async for codec, data in cursor:
+        for msg in reversed(_decode_block(codec, data)):
+            if msg.id not in seen and needle in msg.content.casefold():
+                results.append(msg)
+                if len(results) >= limit:
+                    return results
+    return results
+
+
+async def get_messages_after(after_id: int, limit: int) -> list[StoredMessage]:
+    """Return up to `limit` messages with id > after_id, oldest-first.
+
+    For consumers that walk the stream with a checkpoint. Reads the
+    archive only when the checkpoint is older than the hot table.
+    """
+    assert _db is not None, "Database not initialized — call init_db() first"
+    found: list[StoredMessage] = []
+    cursor = await _db.execute(
+        "SELECT codec, data FROM message_archive WHERE last_id > ? ORDER BY first_id",
+        (after_id,),
+    )
+    async for codec, data in cursor:
+        found.extend(m for m in _decode_block(codec, data) if m.id > after_id)
+        if len(found) >= limit:
+            return found[:limit]
+
+    start = found[-1].id if found else after_id
+    cursor = await _db.execute(
+        "SELECT id, role, content, created_at FROM messages "
+        "WHERE id > ? ORDER BY id LIMIT ?",
+        (start, limit - len(found)),
+    )
+    found.extend(StoredMessage(*row) for row in await cursor.fetchall())
+    return found
+
+
+async def compact_messages(min_age_days: int, keep_recent: int, block_size: int) -> int:
+    """Move old messages from the hot table into compressed archive blocks.
+
+    A message is archived when it is older than `min_age_days` and not
+    among the newest `keep_recent` messages. Each block is written and its
+    rows deleted in one transaction. Trailing rows that don't fill a whole
+    block are left for the next pass.
+
+    Returns:
+        Number of messages archived.
+    """
+    async with _compaction_lock:
+        archived = await _compact(min_age_days, keep_recent, block_size)
+    await _reclaim_free_pages(_VACUUM_PAGES)
+    return archived
+
+
+async def _compact(min_age_days: int, keep_recent: int, block_size: int) -> int:
+    """Archive eligible rows block by block. Caller holds _compaction_lock."""
+    assert _db is not None, "Database not initialized — call init_db() first"
+    cursor = await _db.execute(
+        "SELECT id FROM messages ORDER BY id DESC LIMIT 1 OFFSET ?",
+        (keep_recent,),
+    )
+    row = await cursor.fetchone()
+    if row is None:
+        return 0
+    cursor = await _db.execute(
+        "SELECT MAX(id) FROM messages WHERE created_at < datetime('now', ?)",
+        (f"-{min_age_days} days",),
+    )
+    (aged_id,) = await cursor.fetchone()
+    if aged_id is None:
+        return 0
+    # Everything at or below this id is archived, so blocks are contiguous.
+    max_id = min(row[0], aged_id)
+
+    archived = 0
+    while True:
+        cursor = await _db.execute(
+            "SELECT id, role, content, created_at FROM messages "
+            "WHERE id <= ? ORDER BY id LIMIT ?",
+            (max_id, block_size),
+        )
+        rows = await cursor.fetchall()
+        if len(rows) < block_size:
+            break
+
+        first_id, last_id = rows[0][0], rows[-1][0]
+        data = await asyncio.to_thread(_encode_block, [tuple(r) for r in rows])
+        async with _write_lock:
+            await _db.execute(
+                "INSERT INTO message_archive "
+                "(first_id, last_id, row_count, created_max, codec, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (first_id, last_id, len(rows), rows[-1][3], _CODEC, data),
+            )
+            await _db.execute(
+                "DELETE FROM messages WHERE id BETWEEN ? AND ?",
+                (first_id, last_id),
+            )
+            await _db.commit()
+        archived += len(rows)
+    return archived
+
+
+async def _reclaim_free_pages(budget: int) -> int:
+    """Return up to `budget` free pages to the OS via incremental_vacuum.
+
+    Runs whenever the freelist is non-empty, not only after a pass that
+    archived rows, so pages left over from earlier passes are reclaimed.
+
+    Returns:
+        Number of pages freed.
+    """
+    assert _db is not None, "Database not initialized — call init_db() first"
+    freed = 0
+    async with _write_lock:
+        while freed < budget:
+            cursor = await _db.execute("PRAGMA freelist_count")
+            (before,) = await cursor.fetchone()
+            if before == 0:
+                break
+            # execute() steps the pragma once, freeing a single page;
+            # executescript() runs it to completion.
+            await _db.executescript(
+                f"PRAGMA incremental_vacuum({min(before, budget - freed)});"
+            )
+            cursor = await _db.execute("PRAGMA freelist_count")
+            (after,) = await cursor.fetchone()
+            if after >= before:
+                break
+            freed += before - after
+    return freed
+
+
+async def run_compaction() -> None:
+    """Background job: periodically compact old messages into the archive.
+
+    Runs until cancelled. Intended to be started as a task at startup.
+    Settings are re-read every pass; passes are skipped while disabled.
+    """
+    while True:
+        archive = get_config().archive
+        if archive.enabled:
+            try:
+                archived = await compact_messages(
+                    min_age_days=archive.min_age_days,
+                    keep_recent=archive.keep_recent,
+                    block_size=archive.block_size,
+                )
+                if archived:
+                    logger.info("Archived %d messages", archived)
+            except Exception:
+                logger.exception("Message compaction failed")
+        await asyncio.sleep(archive.interval_seconds)
+
+
+# --- Bulk export / import ---
+
+
+async def iter_messages(
+    snapshot: aiosqlite.Connection, batch_size: int = 1000
+) -> AsyncGenerator[list[StoredMessage], None]:
+    """Yield every stored message in batches: archived blocks, then the hot table.
+
+    Memory is bounded by one archive block or one batch of hot rows.
+    Reads through a read_snapshot() connection, so no rows move between
+    tiers mid-walk.
+    """
+    cursor = await snapshot.execute(
+        "SELECT codec, data FROM message_archive ORDER BY first_id"
+    )
+    async for codec, data in cursor:
+        yield _decode_block(codec, data)
+
+    cursor = await snapshot.execute(
+        "SELECT id, role, content, created_at FROM messages ORDER BY id"
+    )
+    while rows := await cursor.fetchmany(batch_size):
+        yield [StoredMessage(*row) for row in rows]
+
+
+async def iter_facts(
+    snapshot: aiosqlite.Connection, batch_size: int = 1000
+) -> AsyncGenerator[list[dict], None]:
+    """Yield every fact row, current and superseded, in id order."""
+    cursor = await snapshot.execute(
+        "SELECT id, subject, predicate, value, source_ids, confidence, "
+        "updated_at, superseded_by FROM facts ORDER BY id"
+    )
+    while rows := await cursor.fetchmany(batch_size):
+        yield [
+            {
+                "id": row[0],
+                "subject": row[1],
+                "predicate": row[2],
+                "value": row[3],
+                "source_ids": json.loads(row[4]),
+                "confidence": row[5],
+                "updated_at": row[6],
+                "superseded_by": row[7],
+            }
+            for row in rows
+        ]
+
+
+async def get_checkpoints(
+    snapshot: aiosqlite.Connection | None = None,
+) -> dict[str, int]:
+    """Return every consumer checkpoint as {name: last_message_id}.
+
+    Reads the shared connection unless a read_snapshot() is given.
+    """
+    assert _db is not None, "Database not initialized — call init_db() first"
+    cursor = await (snapshot or _db).execute(
+        "SELECT name, last_message_id FROM checkpoints"
+    )
+    return dict(await cursor.fetchall())
+
+
+async def bulk_import(
+    batches: AsyncIterable[tuple[str, list]],
+) -> dict[str, int]:
+    """Import exported rows in a single transaction.
+
+    `batches` yields (table, rows) pairs:
+        ("messages", [StoredMessage, ...])
+        ("facts", [fact dict as produced by iter_facts(), ...])
+        ("checkpoints", [(name, last_message_id), ...])
+
+    The input is first spooled to temporary files, so a slow producer
+    (e.g. an HTTP upload) doesn't hold the write lock and stall live
+    turns; the lock is held only for the insert transaction. Compaction
+    is held off for the same span.
+
+    Messages keep their ids; ids already present in either tier are
+    skipped. Secondary indexes and triggers on `messages` are dropped for
+    the duration and recreated at the end. Facts are merged: rows already
+    present are skipped, the rest get new ids, and where both sides have
+    a current fact for the same subject and predicate the newer one wins.
+    Each checkpoint is moved back, if needed, so imported messages it
+    doesn't cover are extracted again.
+
+    Returns:
+        Rows inserted per table.
+    """
+    assert _db is not None, "Database not initialized — call init_db() first"
+    checkpoints: dict[str, int] = {}
+    with (
+        tempfile.TemporaryFile() as message_spool,
+        tempfile.TemporaryFile() as fact_spool,
+    ):
+        async for table, rows in batches:
+            if table == "messages":
+                rows = [(m.id, m.role, m.content, m.created_at) for m in rows]
+                spool = message_spool
+            elif table == "facts":
+                spool = fact_spool
+            else:
+                checkpoints.update(rows)
+                continue
+            spool.write(json.dumps(rows, ensure_ascii=False).encode() + b"\n")
+        message_spool.seek(0)
+        fact_spool.seek(0)
+
+        # Compaction's reads would otherwise see the uncommitted rows and
+        # could archive them even if this transaction rolls back. Same
+        # lock order as compaction: _compaction_lock, then _write_lock.
+        async with _compaction_lock, _write_lock:
+            await _db.execute("BEGIN")
+            try:
+                current = await get_checkpoints()
+                previous_max_id = await _max_message_id()
+                names = set(checkpoints) | set(current)
+                messages, lowest_new = await _import_messages(
+                    message_spool, {n: checkpoints.get(n, 0) for n in names}
+                )
+                counts = {
+                    "messages": messages,
+                    "facts": await _import_facts(fact_spool),
+                    "checkpoints": await _import_checkpoints(
+                        current, checkpoints, lowest_new, previous_max_id
+                    ),
+                }
+                await _db.commit()
+            except BaseException:
+                await _db.rollback()
+                raise
+    return counts
+
+
+async def _max_message_id() -> int:
+    """Highest message id in either tier (0 if empty)."""
+    assert _db is not None, "Database not initialized — call init_db() first"
+    cursor = await _db.execute(
+        "SELECT MAX(m) FROM (SELECT MAX(id) AS m FROM messages "
+        "UNION ALL SELECT MAX(last_id) FROM message_archive)"
+    )
+    (max_id,) = await cursor.fetchone()
+    return max_id or 0
+
+
+async def _import_messages(
+    spool: IO[bytes], covered: dict[str, int]
+) -> tuple[int, dict[str, int]]:
+    """Insert spooled message batches. Runs inside bulk_import's transaction.
+
+    Args:
+        spool: One JSON array of (id, role, content, created_at) per line.
+        covered: Per checkpoint name, the dump's checkpoint (0 if none).
+
+    Returns:
+        (rows inserted, {name: lowest imported id above `covered[name]`}).
+    """
+    assert _db is not None, "Database not initialized — call init_db() first"
+    cursor = await _db.execute(
+        "SELECT first_id, last_id FROM message_archive ORDER BY first_id"
+    )
+    ranges = await cursor.fetchall()
+    first_ids = [first for first, _ in ranges]
+
+    def is_archived(msg_id: int) -> bool:
+        i = bisect.bisect_right(first_ids, msg_id) - 1
+        return i >= 0 and msg_id <= ranges[i][1]
+
+    cursor = await _db.execute(
+        "SELECT type, name, sql FROM sqlite_master "
+        "WHERE tbl_name = 'messages' AND type IN ('index', 'trigger') "
+        "AND sql IS NOT NULL"
+    )
+    deferred = await cursor.fetchall()
+    for kind, name, _ in deferred:
+        await _db.execute(f'DROP {kind.upper()} "{name}"')
+
+    inserted = 0
+    lowest_new: dict[str, int] = {}
+    for line in spool:
+        rows = json.loads(line)
+        for name, watermark in covered.items():
+            above = [row[0] for row in rows if row[0] > watermark]
+            if above:
+                lowest_new[name] = min(lowest_new.get(name, above[0]), *above)
+        cursor = await _db.executemany(
+            "INSERT OR IGNORE INTO messages (id, role, content, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            [row for row in rows if not is_archived(row[0])],
+        )
+        inserted += max(cursor.rowcount, 0)
+
+    for _, _, sql in deferred:
+        await _db.execute(sql)
+    return inserted, lowest_new
+
+
+async def _import_facts(spool: IO[bytes]) -> int:
+    """Merge spooled fact batches. Runs inside bulk_import's transaction."""
+    assert _db is not None, "Database not initialized — call init_db() first"
+    cursor = await _db.execute(
+        "SELECT id, subject, predicate, value, updated_at FROM facts"
+    )
+    existing = {tuple(row[1:]): row[0] for row in await cursor.fetchall()}
+
+    id_map: dict[int, int] = {}
+    superseded: list[tuple[int, int]] = []
+    inserted = 0
+    for line in spool:
+        for fact in json.loads(line):
+            key = (
+                fact["subject"],
+                fact["predicate"],
+                fact["value"],
+                fact["updated_at"],
+            )
+            if key in existing:
+                id_map[fact["id"]] = existing[key]
+                continue
+            cursor = await _db.execute(
+                "INSERT INTO facts (subject, predicate, value, source_ids, "
+                "confidence, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    fact["subject"],
+                    fact["predicate"],
+                    fact["value"],
+                    json.dumps(fact["source_ids"]),
+                    fact["confidence"],
+                    fact["updated_at"],
+                ),
+            )
+            id_map[fact["id"]] = cursor.lastrowid
+            if fact["superseded_by"] is not None:
+                superseded.append((cursor.lastrowid, fact["superseded_by"]))
+            inserted += 1
+
+    # Superseding facts come later in id order, so link after all inserts.
+    for new_id, old_target in superseded:
+        if old_target in id_map:
+            await _db.execute(
+                "UPDATE facts SET superseded_by = ? WHERE id = ?",
+                (id_map[old_target], new_id),
+            )
+
+    # Where both sides had a current fact for the same key, the newest wins.
+    cursor = await _db.execute(
+        "SELECT subject, predicate FROM facts WHERE superseded_by IS NULL "
+        "GROUP BY subject, predicate HAVING COUNT(*) > 1"
+    )
+    for subject, predicate in await cursor.fetchall():
+        cursor = await _db.execute(
+            "SELECT id FROM facts WHERE subject = ? AND predicate = ? "
+            "AND superseded_by IS NULL ORDER BY updated_at DESC, id DESC",
+            (subject, predicate),
+        )
+        winner, *losers = [row[0] for row in await cursor.fetchall()]
+        await _db.executemany(
+            "UPDATE facts SET superseded_by = ? WHERE id = ?",
+            [(winner, loser) for loser in losers],
+        )
+    return inserted
+
+
+async def _import_checkpoints(
+    current: dict[str, int],
+    dumped: dict[str, int],
+    lowest_new: dict[str, int],
+    previous_max_id: int,
+) -> int:
+    """Set each checkpoint to the highest id both sides have processed.
+
+    Runs inside bulk_import's transaction. A checkpoint is a watermark,
+    so it must stay below the first message either side hasn't run
+    through the consumer yet:
+        - the database's own messages above its checkpoint (none if
+          nothing was stored above it before the import);
+        - imported messages above the dump's checkpoint.
+    If neither side has unprocessed messages, the higher checkpoint wins.
+
+    Returns:
+        Number of checkpoints written.
+    """
+    assert _db is not None, "Database not initialized — call init_db() first"
+    updates = []
+    for name in set(current) | set(dumped):
+        own = current.get(name, 0)
+        bounds = [lowest_new[name] - 1] if name in lowest_new else []
+        if previous_max_id > own:
+            bounds.append(own)
+        value = min(bounds) if bounds else max(own, dumped.get(name, 0))
+        if value != current.get(name):
+            updates.append((name, value))
+    await _db.executemany(
+        "INSERT INTO checkpoints (name, last_message_id) VALUES (?, ?) "
+        "ON CONFLICT (name) DO UPDATE "
+        "SET last_message_id = excluded.last_message_id",
+        updates,
+    )
+    return len(updates)
+
+
+# --- Long-term memory ---
+
+
+def normalize_key(text: str) -> str:
+    """Normalize a fact subject or predicate: lowercase, single-spaced."""
+    return " ".join(text.casefold().split())
+
+
+async def get_checkpoint(name: str) -> int:
+    """Return the last message id processed by consumer `name` (0 if none)."""
+    assert _db is not None, "Database not initialized — call init_db() first"
+    cursor = await _db.execute(
+        "SELECT last_message_id FROM checkpoints WHERE name = ?", (name,)
+    )
+    row = await cursor.fetchone()
+    return row[0] if row else 0
+
+
+async def save_facts(facts: list[Fact], checkpoint: str, last_message_id: int) -> None:
+    """Upsert facts and advance a checkpoint in one transaction.
+
+    For each fact, the current (non-superseded) fact with the same
+    subject and predicate is looked up:
+        - same value: merged — source ids unioned, confidence maxed,
+          updated_at refreshed.
+        - different value: the old fact is superseded by the new one.
+        - none: the fact is inserted.
+    """
+    assert _db is not None, "Database not initialized — call init_db() first"
+    async with _write_lock:
+        try:
+            for fact in facts:
+                subject = normalize_key(fact.subject)
+                predicate = normalize_key(fact.predicate)
+                cursor = await _db.execute(
+                    "SELECT id, value, source_ids, confidence FROM facts "
+                    "WHERE subject = ? AND predicate = ? "
+                    "AND superseded_by IS NULL",
+                    (subject, predicate),
+                )
+                current = await cursor.fetchone()
+
+                if current is not None and (
+                    normalize_key(current[1]) == normalize_key(fact.value)
+                ):
+                    sources = sorted(set(json.loads(current[2])) | set(fact.source_ids))
+                    await _db.execute(
+                        "UPDATE facts SET source_ids = ?, confidence = ?, "
+                        "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                        (
+                            json.dumps(sources),
+                            max(current[3], fact.confidence),
+                            current[0],
+                        ),
+                    )
+                    continue
+
+                cursor = await _db.execute(
+                    "INSERT INTO facts "
+                    "(subject, predicate, value, source_ids, confidence) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        subject,
+                        predicate,
+                        fact.value.strip(),
+                        json.dumps(sorted(set(fact.source_ids))),
+                        fact.confidence,
+                    ),
+                )
+                if current is not None:
+                    await _db.execute(
+                        "UPDATE facts SET superseded_by = ? WHERE id = ?",
+                        (cursor.lastrowid, current[0]),
+                    )
+
+            await _db.execute(
+                "INSERT INTO checkpoints (name, last_message_id) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE "
+                "SET last_message_id = excluded.last_message_id",
+                (checkpoint, last_message_id),
+            )
+            await _db.commit()
+        except BaseException:
+            await _db.rollback()
+            raise
+
+
+async def get_facts(subjects: list[str], limit: int) -> list[Fact]:
+    """Return current facts about any of `subjects`, most confident first.
+
+    Subjects are normalized before lookup. Uses the partial index on
+    current facts, so cost does not grow with superseded history.
+    """
+    assert _db is not None, "Database not initialized — call init_db() first"
+    keys = list(dict.fromkeys(normalize_key(s) for s in subjects if s.strip()))
+    if not keys:
+        return []
+    placeholders = ", ".join("?" * len(keys))
+    cursor = await _db.execute(
+        "SELECT subject, predicate, value, source_ids, confidence, updated_at "
+        f"FROM facts WHERE superseded_by IS NULL AND subject IN ({placeholders}) "
+        "ORDER BY confidence DESC, updated_at DESC LIMIT ?",
+        (*keys, limit),
+    )
+    return [
+        Fact(
+            subject=subject,
+            predicate=predicate,
+            value=value,
+            source_ids=tuple(json.loads(source_ids)),
+            confidence=confidence,
+            updated_at=updated_at,
+        )
+        for subject, predicate, value, source_ids, confidence, updated_at in (
+            await cursor.fetchall()
+        )
+    ]
@@ -0,0 +1,202 @@
+"""
+Background fact extraction (long-term memory, spec §9.1).
+
+Walks the message stream in batches, asks the LLM to pull out durable
+facts (user profile, preferences, learned information), and stores them
+as normalized (subject, predicate, value) triples via the database's
+fact store. Progress is checkpointed by message id in the same
+transaction as the facts, so a restart resumes where it left off.
+
+Usage:
+    from server.fact_extractor import run_fact_extraction
+
+    task = asyncio.create_task(run_fact_extraction())  # at startup
+    task.cancel()                                      # at shutdown
+"""
+
+import asyncio
+import json
+import logging
+import re
+from datetime import UTC, datetime, timedelta
+
+from server.config import get_config
+from server.database import (
+    Fact,
+    StoredMessage,
+    get_checkpoint,
+    get_facts,
+    get_messages_after,
+    save_facts,
+)
+from server.llm.router import Message, get_router
+from server.rate_limit import get_generation_gate
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT = "fact_extractor"
+
+# Seconds between batches while catching up, so a backlog (e.g. the whole
+# history of an existing database) doesn't monopolize the model.
+_BATCH_PAUSE = 5.0
+
+_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
+
+_PROMPT = """\
+Extract durable facts from the conversation below: things worth remembering
+long-term about the user, the people and things in their life, and their
+preferences. Ignore small talk, questions, and anything only true right now.
+
+Use subject "user" for the human and "assistant" for yourself. Reuse the
+predicates of known facts where they fit, so updates replace old values.
+
+Known facts:
+{known}
+
+Conversation (each line is [message id] role: text):
+{transcript}
+
+Respond with only a JSON array, e.g.
+[{{"subject": "user", "predicate": "dog name", "value": "Max",
+  "confidence": 0.9, "source_ids": [12]}}]
+Respond with [] if there is nothing worth remembering."""
+
+
+def _build_prompt(batch: list[StoredMessage], known: list[Fact]) -> str:
+    known_text = "\n".join(f"- {f.subject} | {f.predicate} | {f.value}" for f in known)
+    transcript = "\n".join(f"[{m.id}] {m.role}: {m.content}" for m in batch)
+    return _PROMPT.format(known=known_text or "(none)", transcript=transcript)
+
+
+def _parse_facts(response: str, batch: list[StoredMessage]) -> list[Fact]:
+    """Parse the LLM's JSON array into Facts, dropping malformed entries.
+
+    Raises:
+        ValueError: If the response contains no JSON array.
+    """
+    text = _THINK_RE.sub("", response)
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end < start:
+        raise ValueError("No JSON array in extractor response")
+    items = json.loads(text[start : end + 1])
+    if not isinstance(items, list):
+        raise ValueError("Extractor response is not a JSON array")
+
+    batch_ids = {m.id for m in batch}
+    facts = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        subject, predicate, value = (
+            item.get("subject"),
+            item.get("predicate"),
+            item.get("value"),
+        )
+        if not all(isinstance(x, str) and x.strip() for x in (subject, predicate)):
+            continue
+        if value is None or not str(value).strip():
+            continue
+        sources = [
+            i
+            for i in item.get("source_ids") or []
+            if isinstance(i, int) and i in batch_ids
+        ]
+        try:
+            confidence = min(max(float(item.get("confidence", 0.5)), 0.0), 1.0)
+        except (TypeError, ValueError):
+            confidence = 0.5
+        facts.append(
+            Fact(
+                subject=subject,
+                predicate=predicate,
+                value=str(value),
+                source_ids=tuple(sources or sorted(batch_ids)),
+                confidence=confidence,
+            )
+        )
+    return facts
+
+
+def _is_settled(batch: list[StoredMessage], idle: timedelta) -> bool:
+    """True if the newest message in the batch is older than `idle`."""
+    newest = datetime.fromisoformat(batch[-1].created_at).replace(tzinfo=UTC)
+    return datetime.now(UTC) - newest >= idle
+
+
+async def extract_batch(batch_size: int, idle: timedelta = timedelta(0)) -> int:
+    """Extract facts from the next batch of unprocessed messages.
+
+    A partial batch is only processed once the conversation has been
+    quiet for `idle`, so an active chat doesn't trigger an LLM call per turn.
+
+    Returns:
+        Number of messages processed (0 when caught up or waiting).
+    """
+    after_id = await get_checkpoint(CHECKPOINT)
+    batch = await get_messages_after(after_id, batch_size)
+    if not batch:
+        return 0
+    if len(batch) < batch_size and not _is_settled(batch, idle):
+        return 0
+
+    known = await get_facts(["user", "assistant"], limit=50)
+    prompt = _build_prompt(batch, known)
+    async with get_generation_gate().acquire():
+        response = await get_router().chat([Message(role="user", content=prompt)])
+
+    try:
+        facts = _parse_facts(response, batch)
+    except ValueError:
+        # Don't wedge the stream on one bad response; skip this batch.
+        logger.warning(
+            "Unparseable extractor response for messages %d-%d",
+            batch[0].id,
+            batch[-1].id,
+        )
+        facts = []
+
+    await save_facts(facts, CHECKPOINT, last_message_id=batch[-1].id)
+    if facts:
+        logger.info("Extracted %d facts from %d messages", len(facts), len(batch))
+    return len(batch)
+
+
+def _replaying() -> bool:
+    """True if LLM calls are answered from a recording.
+
+    Extraction prompts embed the current facts, so they never match a
+    recording; skip extraction rather than fail every pass.
+    """
+    llm = get_config().llm
+    return llm.provider == "replay" and llm.replay.mode == "replay"
+
+
+def _model_idle() -> bool:
+    """True if no user turn is generating or waiting for a slot."""
+    gate = get_generation_gate()
+    return gate.active == 0 and gate.queued == 0
+
+
+async def run_fact_extraction() -> None:
+    """Background job: extract facts from new messages until cancelled.
+
+    Sleeps, then works through pending batches with a short pause between
+    them. Sleeping first leaves the model to the first turns after
+    startup (and whatever warm-up cached). Yields to user turns: a batch
+    only starts while no generation is running or queued, otherwise the
+    pass ends early. LLM errors leave the checkpoint untouched so the
+    batch is retried on the next pass. Settings are re-read every pass;
+    passes are skipped while disabled or while replaying recorded LLM
+    exchanges.
+    """
+    while True:
+        await asyncio.sleep(get_config().facts.interval_seconds)
+        facts_config = get_config().facts
+        if not facts_config.enabled or _replaying():
+            continue
+        idle = timedelta(seconds=facts_config.interval_seconds)
+        try:
+            while _model_idle() and await extract_batch(facts_config.batch_size, idle):
+                await asyncio.sleep(_BATCH_PAUSE)
+        except Exception:
+            logger.exception("Fact extraction failed")
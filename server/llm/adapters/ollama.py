@@ -24,16 +24,19 @@ class OllamaAdapter:
 
     Converts between the router's Message format and Ollama's
     dict-based message format. Roles are identical ("user",
-    "assistant") so conversion is trivial.
+    "assistant", "system") so conversion is trivial.
 
     Args:
         model: The Ollama model name (e.g., "qwen3-vl:30b").
         host: Ollama server URL. Empty string uses the SDK default
               (http://localhost:11434).
+        keep_alive: How long Ollama keeps the model loaded after a
+              request (e.g., "30m"). Empty string uses the server default.
     """
 
-    def __init__(self, model: str, host: str = "") -> None:
+    def __init__(self, model: str, host: str = "", keep_alive: str = "") -> None:
         self.model = model
+        self.keep_alive = keep_alive or None
         self._client = AsyncClient(host=host) if host else AsyncClient()
 
     async def chat(self, messages: list[Message]) -> str:
@@ -48,6 +51,7 @@ class OllamaAdapter:
         response = await self._client.chat(
             model=self.model,
             messages=self._to_ollama_messages(messages),
+            keep_alive=self.keep_alive,
         )
         return response.message.content
 
@@ -64,11 +68,37 @@ class OllamaAdapter:
             model=self.model,
             messages=self._to_ollama_messages(messages),
             stream=True,
+            keep_alive=self.keep_alive,
         )
         async for part in response:
             if part.message.content:
                 yield part.message.content
 
+    async def warmup(self, messages: list[Message]) -> None:
+        """Load the model into memory and evaluate `messages` as a prompt.
+
+        Generates a single token so Ollama caches the prompt prefix;
+        with no messages, just loads the model.
+
+        Args:
+            messages: Context the next real request will start with.
+        """
+        if not messages:
+            await self._client.generate(
+                model=self.model, prompt="", keep_alive=self.keep_alive
+            )
+            return
+        await self._client.chat(
+            model=self.model,
+            messages=self._to_ollama_messages(messages),
+            options={"num_predict": 1},
+            keep_alive=self.keep_alive,
+        )
+
+    async def close(self) -> None:
+        """Close the HTTP connection pool. The adapter can't be used afterwards."""
+        await self._client.close()
+
     @staticmethod
     def _to_ollama_messages(
         messages: list[Message],
@@ -0,0 +1,178 @@
+"""
+Record/replay LLM adapter.
+
+Records real chat/stream exchanges from another adapter to a JSONL file,
+including chunk boundaries and inter-chunk timing, and replays them
+deterministically without a model. Used to exercise and profile the
+server (session manager, connection handling) in isolation from model
+latency.
+
+File format (one exchange per line):
+    {"kind": "stream", "key": "<sha256 of messages>", "messages": [...],
+     "chunks": [[0.41, "Hel"], [0.03, "lo"]]}
+    {"kind": "chat", "key": "...", "messages": [...],
+     "response": "Hello", "latency": 1.2}
+Delays are seconds since the previous chunk (the first since the request).
+
+The match key hashes only user and assistant messages. System messages
+are injected by the server (remembered facts) and change whenever the
+fact extractor runs, so including them would make the same turn miss
+its recording. For the same reason the fact extractor is paused while
+replaying: its prompts embed the current facts.
+
+Usage:
+    # Normally instantiated by the router (provider: "replay"):
+    recorder = ReplayAdapter(path, upstream=OllamaAdapter(model="qwen3:14b"))
+    player = ReplayAdapter(path, time_scale=0)   # instant replay
+    async for chunk in player.stream(messages):
+        print(chunk)
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import defaultdict
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+from server.llm.router import LLMAdapter, Message
+
+
+class ReplayAdapter:
+    """Adapter that records exchanges from `upstream`, or replays a recording.
+
+    With an upstream adapter, every completed chat/stream call is
+    forwarded and appended to the recording. Without one, calls are
+    answered from the recording loaded at construction.
+
+    Args:
+        path: JSONL recording file.
+        upstream: Adapter to record from. None replays instead.
+        match: "messages" replays the recording whose user/assistant
+            messages match exactly (repeated inputs cycle through their
+            recordings); "sequence" replays recordings of each kind in
+            file order, wrapping around, regardless of input.
+        time_scale: Multiplier for recorded delays. 0 replays instantly.
+
+    Raises:
+        FileNotFoundError: If replaying and the recording doesn't exist.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        upstream: LLMAdapter | None = None,
+        match: str = "messages",
+        time_scale: float = 1.0,
+    ) -> None:
+        self.path = path
+        self.upstream = upstream
+        self.match = match
+        self.time_scale = time_scale
+        self._by_key: dict[str, list[dict]] = defaultdict(list)
+        self._by_kind: dict[str, list[dict]] = defaultdict(list)
+        self._cursors: dict[str, int] = defaultdict(int)
+
+        if upstream is None:
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        # Re-derive the key, so recordings made before a
+                        # change to _key() still match.
+                        key = self._key([Message(**m) for m in record["messages"]])
+                        self._by_key[f"{record['kind']}:{key}"].append(record)
+                        self._by_kind[record["kind"]].append(record)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+    async def chat(self, messages: list[Message]) -> str:
+        """Return the recorded (or freshly recorded) complete response."""
+        if self.upstream is not None:
+            start = time.perf_counter()
+            response = await self.upstream.chat(messages)
+            self._append(
+                "chat",
+                messages,
+                response=response,
+                latency=time.perf_counter() - start,
+            )
+            return response
+
+        record = self._next("chat", messages)
+        await self._sleep(record["latency"])
+        return record["response"]
+
+    async def stream(self, messages: list[Message]) -> AsyncGenerator[str, None]:
+        """Yield recorded chunks with their recorded spacing (time-scaled)."""
+        if self.upstream is not None:
+            chunks: list[tuple[float, str]] = []
+            last = time.perf_counter()
+            async for chunk in self.upstream.stream(messages):
+                chunks.append((time.perf_counter() - last, chunk))
+                yield chunk
+                # Restart after the consumer resumes us, so time spent
+                # downstream (e.g. sending to the client) isn't recorded
+                # as model latency.
+                last = time.perf_counter()
+            self._append("stream", messages, chunks=chunks)
+            return
+
+        record = self._next("stream", messages)
+        for delay, chunk in record["chunks"]:
+            await self._sleep(delay)
+            yield chunk
+
+    async def warmup(self, messages: list[Message]) -> None:
+        """Warm the upstream adapter when recording; nothing to do on replay."""
+        warmup = getattr(self.upstream, "warmup", None)
+        if warmup is not None:
+            await warmup(messages)
+
+    async def close(self) -> None:
+        """Close the upstream adapter when recording; nothing to do on replay."""
+        close = getattr(self.upstream, "close", None)
+        if close is not None:
+            await close()
+
+    @staticmethod
+    def _key(messages: list[Message]) -> str:
+        """Stable hash of the input's user and assistant messages."""
+        payload = json.dumps(
+            [[m.role, m.content] for m in messages if m.role != "system"],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _append(self, kind: str, messages: list[Message], **fields: object) -> None:
+        """Append one completed exchange to the recording."""
+        record = {
+            "kind": kind,
+            "key": self._key(messages),
+            "messages": [{"role": m.role, "content": m.content} for m in messages],
+            **fields,
+        }
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _next(self, kind: str, messages: list[Message]) -> dict:
+        """Pick the recording to replay for this call.
+
+        Raises:
+            LookupError: If no recording matches.
+        """
+        if self.match == "sequence":
+            queue_name, queue = kind, self._by_kind[kind]
+        else:
+            queue_name = f"{kind}:{self._key(messages)}"
+            queue = self._by_key[queue_name]
+        if not queue:
+            raise LookupError(f"No recorded {kind} exchange matches this input")
+        index = self._cursors[queue_name]
+        self._cursors[queue_name] = index + 1
+        return queue[index % len(queue)]
+
+    async def _sleep(self, delay: float) -> None:
+        # Always yield to the event loop, even when replaying instantly.
+        await asyncio.sleep(delay * self.time_scale)
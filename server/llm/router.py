@@ -16,16 +16,28 @@ Usage:
     async for chunk in router.stream(messages):
         send_to_client(chunk)
 
+    # Preload the model at startup (no-op if the adapter can't):
+    await router.warmup(messages)
+
+    # Swap in a new router (hot reload); the old one closes its adapter
+    # once its in-flight calls finish:
+    set_router(build_router(config.llm))
+
 Message format:
     Messages are a list of Message(role, content) dataclasses.
-    role is "user" or "assistant". content is a string.
+    role is "user" or "assistant" (or "system" for context the server
+    injects, such as remembered facts). content is a string.
 """
 
+import asyncio
+import logging
 from collections.abc import AsyncGenerator
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Protocol, runtime_checkable
 
-from server.config import LLMConfig
+from server.config import PROJECT_ROOT, LLMConfig
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -33,7 +45,7 @@ class Message:
     """A single message in a conversation.
 
     Args:
-        role: "user" or "assistant".
+        role: "user", "assistant", or "system".
         content: The text content of the message.
     """
 
@@ -47,6 +59,11 @@ class LLMAdapter(Protocol):
 
     Adapters receive messages in the standard Message format
     and handle conversion to provider-specific formats internally.
+
+    Adapters may also define `async def warmup(messages) -> None` to
+    preload the model, and `async def close() -> None` to release
+    connections when the router is replaced. Both are optional and
+    looked up with getattr().
     """
 
     async def chat(self, messages: list[Message]) -> str:
@@ -62,24 +79,80 @@ class LLMRouter:
     """Routes LLM calls to the configured adapter.
 
     Instantiated once via get_router(). Delegates chat() and stream()
-    to whichever adapter is configured in config.yaml.
+    to whichever adapter is configured in config.yaml. Counts in-flight
+    calls so a retired router can close its adapter once they finish.
     """
 
     def __init__(self, adapter: LLMAdapter) -> None:
         self.adapter = adapter
+        self._active = 0
+        self._retired = False
 
     async def chat(self, messages: list[Message]) -> str:
         """Send messages to the LLM, return complete response."""
-        return await self.adapter.chat(messages)
+        self._active += 1
+        try:
+            return await self.adapter.chat(messages)
+        finally:
+            self._release()
 
     async def stream(self, messages: list[Message]) -> AsyncGenerator[str, None]:
         """Send messages to the LLM, yield response chunks."""
-        async for chunk in self.adapter.stream(messages):
-            yield chunk
+        self._active += 1
+        try:
+            async for chunk in self.adapter.stream(messages):
+                yield chunk
+        finally:
+            self._release()
+
+    async def warmup(self, messages: list[Message]) -> None:
+        """Preload the model with `messages` as context, if the adapter supports it."""
+        warmup = getattr(self.adapter, "warmup", None)
+        if warmup is None:
+            return
+        self._active += 1
+        try:
+            await warmup(messages)
+        finally:
+            self._release()
+
+    def retire(self) -> None:
+        """Close the adapter once in-flight calls finish. Called by set_router().
+
+        Must be called from the event loop.
+        """
+        self._retired = True
+        if not self._active:
+            _schedule_close(self.adapter)
+
+    def _release(self) -> None:
+        self._active -= 1
+        if self._retired and not self._active:
+            _schedule_close(self.adapter)
 
 
 _router: LLMRouter | None = None
 
+# Adapter close() tasks, referenced until done so they aren't collected.
+_closing: set[asyncio.Task[None]] = set()
+
+
+def _schedule_close(adapter: LLMAdapter) -> None:
+    """Close `adapter` in the background, if it has a close() method."""
+    close = getattr(adapter, "close", None)
+    if close is None:
+        return
+
+    async def run() -> None:
+        try:
+            await close()
+        except Exception:
+            logger.exception("Closing retired LLM adapter failed")
+
+    task = asyncio.get_running_loop().create_task(run())
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
 
 def get_router() -> LLMRouter:
     """Get the cached router. Creates it on first call using config.
@@ -103,6 +176,28 @@ def get_router() -> LLMRouter:
     return _router
 
 
+def build_router(llm_config: LLMConfig) -> LLMRouter:
+    """Create a new router for `llm_config` without installing it.
+
+    Raises:
+        ValueError: If the configured provider is not supported.
+    """
+    return LLMRouter(_create_adapter(llm_config))
+
+
+def set_router(router: LLMRouter) -> None:
+    """Replace the cached router. Used by hot reload.
+
+    Callers that already hold the old router (in-flight generations)
+    keep using it; the next get_router() call returns the new one. The
+    old router closes its adapter once those calls have finished.
+    """
+    global _router
+    old, _router = _router, router
+    if old is not None and old is not router:
+        old.retire()
+
+
 def _create_adapter(llm_config: LLMConfig) -> LLMAdapter:
     """Instantiate the adapter for the configured provider."""
     if llm_config.provider == "ollama":
@@ -111,5 +206,19 @@ def _create_adapter(llm_config: LLMConfig) -> LLMAdapter:
         return OllamaAdapter(
             model=llm_config.model,
             host=llm_config.host,
+            keep_alive=llm_config.keep_alive,
+        )
+    if llm_config.provider == "replay":
+        from server.llm.adapters.replay import ReplayAdapter
+
+        replay = llm_config.replay
+        upstream = None
+        if replay.mode == "record":
+            upstream = _create_adapter(replace(llm_config, provider=replay.upstream))
+        return ReplayAdapter(
+            path=PROJECT_ROOT / replay.file,
+            upstream=upstream,
+            match=replay.match,
+            time_scale=replay.time_scale,
         )
     raise ValueError(f"Unknown LLM provider: {llm_config.provider}")
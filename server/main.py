@@ -4,24 +4,71 @@ FastAPI application entrypoint.
 Starts the coordination server with a WebSocket endpoint.
 In production, also serves the built Svelte client from client/dist/.
 Run with: uvicorn server.main:app --reload
+
+Health:
+    GET /health        — liveness: 200 as soon as the process serves requests.
+    GET /health/ready  — readiness: 503 until startup warm-up has finished,
+                         so a reverse proxy can hold traffic until then.
 """
 
+import asyncio
 from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
-from fastapi import FastAPI, WebSocket
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
+from server.backup import export_ndjson, import_ndjson
+from server.config import get_config
+from server.config_reload import reload_stats, watch_config
 from server.connection import websocket_endpoint
-from server.database import close_db, init_db
+from server.database import close_db, init_db, lock_database, run_compaction
+from server.fact_extractor import run_fact_extraction
+from server.session_manager import warm_up
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Startup: init database. Shutdown: close database."""
+    """Startup: init database, start warm-up and background jobs.
+
+    Warm-up runs in the background so liveness is reported immediately;
+    readiness flips once it completes.
+
+    Shutdown: stop background jobs, close database.
+    """
     await init_db()
+    lock_database()
+    config = get_config()
+    app.state.ready = False
+
+    async def warm() -> None:
+        await warm_up()
+        app.state.ready = True
+
+    async def extract_facts(warming: asyncio.Task[None] | None) -> None:
+        # Don't compete with warm-up for the model.
+        if warming is not None:
+            await asyncio.wait([warming])
+        await run_fact_extraction()
+
+    jobs: list[asyncio.Task[None]] = []
+    warming = None
+    if config.server.warmup:
+        warming = asyncio.create_task(warm())
+        jobs.append(warming)
+    else:
+        app.state.ready = True
+    jobs.append(asyncio.create_task(run_compaction()))
+    jobs.append(asyncio.create_task(extract_facts(warming)))
+    if config.server.reload_interval > 0:
+        jobs.append(asyncio.create_task(watch_config()))
     yield
+    for job in jobs:
+        job.cancel()
+        with suppress(asyncio.CancelledError):
+            await job
     await close_db()
 
 
@@ -29,9 +76,47 @@ app = FastAPI(title="ACE Coordination Server", lifespan=lifespan)
 
 
 @app.get("/health")
-async def health() -> dict[str, str]:
-    """Health check endpoint."""
-    return {"status": "ok"}
+async def health() -> dict[str, str | bool | int]:
+    """Liveness check. Also reports readiness and config reload counts."""
+    return {
+        "status": "ok",
+        "ready": app.state.ready,
+        "config_reloads": reload_stats.reloads,
+        "config_reload_failures": reload_stats.failures,
+    }
+
+
+@app.get("/health/ready")
+async def ready(response: Response) -> dict[str, str]:
+    """Readiness check: 503 until startup warm-up has finished."""
+    if not app.state.ready:
+        response.status_code = 503
+        return {"status": "warming"}
+    return {"status": "ready"}
+
+
+def _require_admin() -> None:
+    """Hide admin routes unless server.admin_routes is enabled."""
+    if not get_config().server.admin_routes:
+        raise HTTPException(status_code=404)
+
+
+@app.get("/admin/export")
+async def admin_export() -> StreamingResponse:
+    """Stream the memory stream as NDJSON."""
+    _require_admin()
+    return StreamingResponse(export_ndjson(), media_type="application/x-ndjson")
+
+
+@app.post("/admin/import")
+async def admin_import(request: Request) -> dict[str, dict[str, int]]:
+    """Bulk-import an NDJSON request body produced by /admin/export."""
+    _require_admin()
+    try:
+        counts = await import_ndjson(request.stream())
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid NDJSON: {e}") from e
+    return {"imported": counts}
 
 
 @app.websocket("/ws")
@@ -5,7 +5,7 @@ Defines the JSON message format for client-server communication.
 All messages have a 'type' field and a 'payload' field.
 
 Implemented: user.input.text, assistant.response.text,
-history.request, history.response,
+history.request, history.response, generation.queued,
 connection.ping, connection.pong, error.
 
 Full protocol defined in protocol.md at project root.
@@ -84,6 +84,15 @@ class HistoryResponse(BaseModel):
     payload: HistoryResponsePayload
 
 
+class GenerationQueuedPayload(CamelModel):
+    position: int
+
+
+class GenerationQueued(BaseModel):
+    type: Literal["generation.queued"] = "generation.queued"
+    payload: GenerationQueuedPayload
+
+
 class ErrorPayload(BaseModel):
     code: str
     message: str
@@ -119,18 +128,34 @@ class ProtocolError(Exception):
 
 def parse_incoming(
     raw: str,
+    max_bytes: int | None = None,
 ) -> UserInputText | ConnectionPing | HistoryRequest:
     """Parse a raw JSON string into a typed incoming message.
 
     Args:
         raw: JSON string with 'type' and optional 'payload' fields.
+        max_bytes: Reject frames larger than this (UTF-8 encoded) before
+            decoding. None disables the check.
 
     Returns:
         A validated message model instance.
 
     Raises:
-        ProtocolError: If JSON is invalid, type is unknown, or payload fails validation.
+        ProtocolError: If the frame is too large, JSON is invalid, type is
+            unknown, or payload fails validation.
     """
+    if max_bytes is not None:
+        # Each char encodes to 1-4 bytes, so only encode when the length
+        # alone can't decide.
+        too_large = len(raw) > max_bytes or (
+            len(raw) * 4 > max_bytes and len(raw.encode()) > max_bytes
+        )
+        if too_large:
+            raise ProtocolError(
+                "MESSAGE_TOO_LARGE",
+                f"Message exceeds {max_bytes} bytes",
+            )
+
     try:
         data = json.loads(raw)
     except json.JSONDecodeError as e:
@@ -0,0 +1,210 @@
+"""
+Admission control for the WebSocket endpoint.
+
+Token-bucket rate limiting per connection and per message type, plus a
+server-wide cap on concurrent LLM generations. Transport-level only —
+knows nothing about message contents or business logic.
+
+Usage:
+    from server.rate_limit import ConnectionLimiter, get_generation_gate
+
+    limiter = ConnectionLimiter(config.limits)   # one per connection
+    if not limiter.allow_frame():                # every frame, before parsing
+        reject()
+    if not limiter.allow("user.input.text"):     # after parsing
+        reject()
+
+    async with get_generation_gate().acquire(on_queued=notify_position):
+        ...  # run the LLM turn
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+from server.config import LimitsConfig, RateLimit, get_config
+
+
+class TokenBucket:
+    """Classic token bucket. Starts full; refills continuously at `rate`/s.
+
+    Args:
+        rate: Tokens added per second.
+        burst: Maximum tokens the bucket can hold.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    @classmethod
+    def from_limit(cls, limit: RateLimit) -> "TokenBucket":
+        return cls(rate=limit.rate, burst=limit.burst)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    def peek(self) -> bool:
+        """Return True if a token is available, without consuming it."""
+        self._refill()
+        return self._tokens >= 1.0
+
+    def consume(self) -> None:
+        """Take one token. Call only after peek() returned True."""
+        self._tokens -= 1.0
+
+    def resized(self, limit: RateLimit) -> "TokenBucket":
+        """Return a bucket for `limit` holding this bucket's current tokens.
+
+        Tokens are capped at the new burst, so a config change can't be
+        used to refill a drained bucket.
+        """
+        self._refill()
+        bucket = TokenBucket.from_limit(limit)
+        bucket._tokens = min(float(bucket.burst), self._tokens)
+        return bucket
+
+
+class ConnectionLimiter:
+    """Per-connection rate limits: one global bucket plus one per message type.
+
+    Every incoming frame costs a connection token before it is parsed,
+    so malformed or unknown frames are throttled too. A parsed message
+    must then also get a token from its type bucket.
+
+    Args:
+        limits: The limits section of the server config.
+    """
+
+    def __init__(self, limits: LimitsConfig) -> None:
+        self.limits = limits
+        self._connection = TokenBucket.from_limit(limits.connection_rate)
+        self._by_type = {
+            msg_type: TokenBucket.from_limit(limit)
+            for msg_type, limit in limits.message_rates.items()
+        }
+
+    def reconfigure(self, limits: LimitsConfig) -> None:
+        """Switch to new limits, carrying over each bucket's current tokens.
+
+        Buckets for message types that are new in `limits` start full.
+        """
+        self.limits = limits
+        self._connection = self._connection.resized(limits.connection_rate)
+        self._by_type = {
+            msg_type: (
+                self._by_type[msg_type].resized(limit)
+                if msg_type in self._by_type
+                else TokenBucket.from_limit(limit)
+            )
+            for msg_type, limit in limits.message_rates.items()
+        }
+
+    def allow_frame(self) -> bool:
+        """Check and consume a connection token for a frame, before parsing it."""
+        if not self._connection.peek():
+            return False
+        self._connection.consume()
+        return True
+
+    def allow(self, msg_type: str) -> bool:
+        """Check and consume a type token for a parsed message of `msg_type`."""
+        type_bucket = self._by_type.get(msg_type)
+        if type_bucket is None:
+            return True
+        if not type_bucket.peek():
+            return False
+        type_bucket.consume()
+        return True
+
+
+class GenerationGate:
+    """Server-wide cap on concurrent LLM generations with FIFO queueing.
+
+    Callers beyond the cap wait in arrival order. Waiters are told their
+    1-based queue position once, when they start waiting.
+
+    Args:
+        max_concurrent: Maximum generations running at once.
+    """
+
+    def __init__(self, max_concurrent: int) -> None:
+        self.max_concurrent = max_concurrent
+        self._active = 0
+        self._waiters: list[asyncio.Future[None]] = []
+
+    def configure(self, max_concurrent: int) -> None:
+        """Change the cap. Waiters are admitted immediately if it grew."""
+        self.max_concurrent = max_concurrent
+        self._wake()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        on_queued: Callable[[int], Awaitable[None]] | None = None,
+    ) -> AsyncGenerator[None, None]:
+        """Hold a generation slot for the duration of the block.
+
+        Args:
+            on_queued: Awaited with the queue position if the caller
+                has to wait for a slot.
+        """
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+        else:
+            waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                if on_queued is not None:
+                    await on_queued(len(self._waiters))
+                await waiter
+            except BaseException:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.done() and not waiter.cancelled():
+                    # Slot was handed to us just as we were cancelled.
+                    self._active -= 1
+                    self._wake()
+                raise
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._wake()
+
+    def _wake(self) -> None:
+        """Hand free slots to waiters in FIFO order."""
+        while self._waiters and self._active < self.max_concurrent:
+            waiter = self._waiters.pop(0)
+            if not waiter.done():
+                self._active += 1
+                waiter.set_result(None)
+
+
+_gate: GenerationGate | None = None
+
+
+def get_generation_gate() -> GenerationGate:
+    """Get the shared generation gate. Creates it on first call using config.
+
+    Returns:
+        The GenerationGate singleton.
+    """
+    global _gate
+    if _gate is None:
+        _gate = GenerationGate(get_config().limits.max_concurrent_generations)
+    return _gate
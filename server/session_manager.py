@@ -7,7 +7,8 @@ assembles recent context for the LLM, streams the response.
 Future: this module will grow into the full consciousness model —
 multi-source activation (semantic search, facts, temporal patterns),
 dynamic space allocation, variable-detail representations. For now
-it loads the last N messages by recency.
+it loads the last N messages by recency, prefixed with long-term facts
+about the user and anything named in the new message.
 
 Usage:
     from server.session_manager import handle_user_message, get_recent_history
@@ -16,23 +17,77 @@ Usage:
         send_chunk_to_client(chunk)
 
     history = await get_recent_history()  # for client display on connect
+
+    await warm_up()  # at startup: load model, prime DB pages
 """
 
+import asyncio
+import logging
+import re
 from collections.abc import AsyncGenerator
 
 from server.config import get_config
-from server.database import append_message, get_recent_messages
+from server.database import append_message, get_facts, get_recent_messages
 from server.llm.router import Message, get_router
 
 # Display limit for history sent to client on reconnect.
 _DISPLAY_LIMIT = 100
 
+# Max distinct words from the user's message used as fact subjects.
+_MAX_FACT_TERMS = 200
+
+_WORD_RE = re.compile(r"\w+")
+
+logger = logging.getLogger(__name__)
+
+
+async def get_relevant_facts(text: str, limit: int) -> Message | None:
+    """Build a system message with facts relevant to the user's text.
+
+    Always includes facts about the user and the assistant, plus facts
+    whose subject is a word in `text`.
+
+    Returns:
+        A system Message listing the facts, or None if there are none.
+    """
+    terms = list(dict.fromkeys(_WORD_RE.findall(text.casefold())))
+    facts = await get_facts(
+        ["user", "assistant", *terms[:_MAX_FACT_TERMS]], limit=limit
+    )
+    if not facts:
+        return None
+    lines = "\n".join(f"- {f.subject} | {f.predicate} | {f.value}" for f in facts)
+    return Message(
+        role="system",
+        content=f"Things you remember (subject | predicate | value):\n{lines}",
+    )
+
+
+async def _assemble_context(text: str, limit: int | None = None) -> list[Message]:
+    """Load the recent context window, prefixed with relevant facts.
+
+    Args:
+        text: The new user message, used to pick relevant facts.
+        limit: Rows to load. Defaults to llm.context_messages.
+    """
+    config = get_config()
+    if limit is None:
+        limit = config.llm.context_messages
+    rows = await get_recent_messages(limit=limit)
+    history = [Message(role=role, content=content) for role, content in rows]
+    if config.facts.enabled:
+        facts = await get_relevant_facts(text, limit=config.facts.inject_limit)
+        if facts is not None:
+            history.insert(0, facts)
+    return history
+
 
 async def handle_user_message(text: str) -> AsyncGenerator[str, None]:
     """Process a user message and stream the LLM response.
 
     1. Persist the user message
-    2. Load recent context (last context_messages from DB)
+    2. Load recent context (last context_messages from DB), prefixed
+       with relevant long-term facts
     3. Stream LLM response, yielding chunks
     4. Persist the complete assistant response
 
@@ -43,10 +98,7 @@ async def handle_user_message(text: str) -> AsyncGenerator[str, None]:
         Response text chunks as they arrive from the LLM.
     """
     await append_message("user", text)
-
-    config = get_config()
-    rows = await get_recent_messages(limit=config.llm.context_messages)
-    history = [Message(role=role, content=content) for role, content in rows]
+    history = await _assemble_context(text)
 
     router = get_router()
     full_text = ""
@@ -65,3 +117,25 @@ async def get_recent_history() -> list[Message]:
     """
     rows = await get_recent_messages(limit=_DISPLAY_LIMIT)
     return [Message(role=role, content=content) for role, content in rows]
+
+
+async def warm_up() -> None:
+    """Prepare for the first turn: build the router, load the model with
+    the current context, and read the recent history so its pages are cached.
+
+    The LLM and database steps run concurrently. LLM failures are logged,
+    not raised — the server can still serve history without a model.
+    """
+
+    async def warm_llm() -> None:
+        # The next turn appends its user message before loading the window,
+        # so it starts with the facts message (user/assistant facts, unless
+        # the message names other subjects) and the newest
+        # context_messages - 1 rows stored now. Warm exactly that prefix.
+        limit = get_config().llm.context_messages - 1
+        try:
+            await get_router().warmup(await _assemble_context("", limit))
+        except Exception:
+            logger.exception("LLM warm-up failed")
+
+    await asyncio.gather(warm_llm(), get_recent_history())